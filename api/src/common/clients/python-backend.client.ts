@@ -20,6 +20,7 @@ export interface InvoiceInput {
   description?: string;
   invoiceNumber?: string;
   vendorName?: string;
+  updatedAt?: string;
 }
 
 export interface TransactionInput {
@@ -28,6 +29,7 @@ export interface TransactionInput {
   currency: string;
   postedAt: string;
   description?: string;
+  updatedAt?: string;
 }
 
 export interface ScoreCandidatesResponse {
@@ -122,6 +122,7 @@ export class ReconciliationService {
       description: inv.description ?? undefined,
       invoiceNumber: inv.invoiceNumber ?? undefined,
       vendorName: inv.vendorId ? vendorMap.get(inv.vendorId) : undefined,
+      updatedAt: inv.updatedAt.toISOString(),
     }));
 
     const transactionsInput = transactionRecords.map((txn) => ({
@@ -130,6 +131,7 @@ export class ReconciliationService {
       currency: txn.currency,
       postedAt: txn.postedAt.toISOString(),
       description: txn.description ?? undefined,
+      updatedAt: txn.updatedAt.toISOString(),
     }));
 
     this.logger.debug(
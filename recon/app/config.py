@@ -22,6 +22,20 @@ class Settings(BaseSettings):
     # Tolerances
     amount_tolerance_percent: float = 2.0
     date_proximity_days: int = 3
+    min_candidate_score: float = 10.0
+    
+    # Candidate blocking (pairs outside both windows skip fuzzy matching)
+    blocking_amount_percent: float = 20.0
+    blocking_days: int = 30
+    text_blocking_min_trigrams: int = 0
+    
+    # Cross-run cache of fuzzy ratios per (invoice, transaction) version
+    score_cache_size: int = 100_000
+    
+    # Batches with more invoice x transaction pairs than this are scored
+    # in a process pool (0 workers disables the pool)
+    process_pool_workers: Optional[int] = None
+    process_pool_threshold: int = 100_000
     
     class Config:
         env_file = ".env"
@@ -16,9 +16,10 @@ DATABASE_URL = os.getenv(
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL logging
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=False,  # Avoid a SELECT 1 round-trip on every checkout
+    pool_recycle=1800,  # Refresh connections older than 30 minutes instead
+    pool_size=20,
+    max_overflow=40,
 )
 
 # Session factory
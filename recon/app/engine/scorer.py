@@ -1,14 +1,263 @@
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Union
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+import threading
 from datetime import datetime, timedelta
-from decimal import Decimal
-from fuzzywuzzy import fuzz
+import math
+from cachetools import LRUCache
+from rapidfuzz import fuzz, process
+import numpy as np
 import logging
 
+from app.engine.scorer_kernels import (
+    amount_score_core,
+    bps_diff_core,
+    date_score_core,
+    score_kernel,
+    top_n_kernel,
+)
+
 logger = logging.getLogger(__name__)
 
+# Invoice fields compared against the transaction description, in priority order
+INVOICE_TEXT_FIELDS = ('description', 'invoice_number', 'vendor_name')
+
+# Text score given to pairs that were pruned before fuzzy matching
+BLOCKED_TEXT_SCORE = 0.3
+
+# partial_ratio values below this count as 0; lets RapidFuzz abandon
+# hopeless alignments early instead of finishing the DP
+TEXT_SCORE_CUTOFF = 30
+
+# Invoice x transaction pairs scored at once. A currency bucket is split
+# into runs of invoices so peak memory stays bounded: the per-pair matrices
+# take roughly 100 bytes per pair, about 25 MB per tile, instead of growing
+# with the whole bucket
+SCORE_TILE_PAIRS = 256 * 1024
+
+
+@lru_cache(maxsize=8192)
+def _cached_partial_ratio(a: str, b: str) -> int:
+    """
+    partial_ratio rounded half-up, the same as the uint8 batch path
+    
+    Callers pass lowercased strings so cache hits are case-insensitive;
+    recurring vendors and bank descriptions hit the cache across requests.
+    No RapidFuzz processor is applied: punctuation such as the dash in
+    "INV-001" has to survive for the substring checks to agree.
+    """
+    return math.floor(
+        fuzz.partial_ratio(a, b, processor=None, score_cutoff=TEXT_SCORE_CUTOFF) + 0.5
+    )
+
+
+def _to_cents(amount) -> int:
+    """Amount (float, Decimal or str) as integer cents"""
+    return round(float(amount) * 100)
+
+
+def _normalize_invoice_texts(
+    invoice_desc: Optional[str],
+    invoice_number: Optional[str],
+    vendor_name: Optional[str]
+) -> tuple[str, str, str]:
+    """Lowercased INVOICE_TEXT_FIELDS values, '' for missing ones"""
+    return (
+        (invoice_desc or '').lower(),
+        (invoice_number or '').lower(),
+        (vendor_name or '').lower(),
+    )
+
+
+def _substring_ratios(
+    invoice_texts: tuple[str, str, str],
+    transaction_text: str
+) -> Optional[tuple[int, int, int]]:
+    """
+    partial_ratio values implied by a literal invoice number or vendor match
+    
+    A substring always scores 100, which already decides the text score, so
+    the fuzzy comparison can be skipped. Returns None when neither matches.
+    """
+    _, number_text, vendor_text = invoice_texts
+    number_hit = bool(number_text) and number_text in transaction_text
+    vendor_hit = bool(vendor_text) and vendor_text in transaction_text
+    if not (number_hit or vendor_hit):
+        return None
+    return 0, 100 if number_hit else 0, 100 if vendor_hit else 0
+
+
+def _resolve_text_score(
+    ratios,
+    invoice_texts: tuple[str, str, str],
+    transaction_text: str,
+    invoice_number: Optional[str],
+    vendor_name: Optional[str]
+) -> tuple[float, str]:
+    """
+    Turn precomputed partial_ratio values (one per INVOICE_TEXT_FIELDS entry,
+    0-100) into a text score, applying the substring bonuses
+    
+    invoice_texts and transaction_text are already lowercased (see
+    _normalize_invoice_texts); invoice_number and vendor_name are the
+    original values, used for the explanation only.
+    
+    Returns: (score, explanation)
+    """
+    if not transaction_text or not any(invoice_texts):
+        return 0.3, "Insufficient text data for comparison"
+    
+    _, number_text, vendor_text = invoice_texts
+    
+    # Pick the best scoring field (first one wins on ties)
+    max_score = 0.0
+    best_match = ""
+    
+    for invoice_text, ratio in zip(invoice_texts, ratios):
+        ratio = float(ratio) / 100.0
+        if invoice_text and ratio > max_score:
+            max_score = ratio
+            best_match = invoice_text[:50]
+    
+    # Also check if invoice number appears in transaction
+    if number_text and number_text in transaction_text:
+        max_score = max(max_score, 0.9)
+        best_match = f"Invoice number '{invoice_number}' found in description"
+    
+    # Check vendor name match
+    if vendor_text and vendor_text in transaction_text:
+        max_score = max(max_score, 0.85)
+        best_match = f"Vendor name '{vendor_name}' found in description"
+    
+    explanation = f"Text similarity: {int(max_score * 100)}%"
+    if best_match:
+        explanation += f" (matched: {best_match})"
+    
+    return max_score, explanation
+
+
+@lru_cache(maxsize=8192)
+def _cached_text_score(
+    invoice_desc: Optional[str],
+    transaction_desc: Optional[str],
+    invoice_number: Optional[str],
+    vendor_name: Optional[str]
+) -> tuple[float, str]:
+    """
+    calculate_text_score for one set of texts
+    
+    The text score only depends on these four strings, so an invoice scored
+    against many transactions (or re-reconciled) reuses earlier results.
+    """
+    invoice_texts = _normalize_invoice_texts(invoice_desc, invoice_number, vendor_name)
+    transaction_text = (transaction_desc or '').lower()
+    
+    # A literal invoice number or vendor in the description is a 100
+    # partial_ratio, so it decides the score without any fuzzy matching
+    substring_ratios = _substring_ratios(invoice_texts, transaction_text)
+    if substring_ratios is not None:
+        return _resolve_text_score(
+            substring_ratios, invoice_texts, transaction_text, invoice_number, vendor_name
+        )
+    
+    ratios = []
+    best = 0
+    
+    for text in invoice_texts:
+        # Empty strings always score 0, and once a field scores 100 no
+        # later field can replace it, so skip the DP in both cases
+        if text and transaction_text and best < 100:
+            ratio = _cached_partial_ratio(text, transaction_text)
+            best = max(best, ratio)
+        else:
+            ratio = 0
+        ratios.append(ratio)
+    
+    return _resolve_text_score(
+        ratios, invoice_texts, transaction_text, invoice_number, vendor_name
+    )
+
+
+def _trigrams(text: str) -> set:
+    """Distinct character trigrams of text (the whole text when shorter)"""
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[k:k + 3] for k in range(len(text) - 2)}
+
+
+def _currency_of(row) -> str:
+    """Currency of a record or a raw dict row"""
+    return row.get('currency') if isinstance(row, dict) else row.currency
+
+
+@dataclass(slots=True, frozen=True)
+class InvoiceRecord:
+    """Invoice fields used for scoring"""
+    id: str
+    amount: float
+    currency: str
+    invoice_date: Optional[datetime] = None
+    description: Optional[str] = None
+    invoice_number: Optional[str] = None
+    vendor_name: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'InvoiceRecord':
+        return cls(
+            id=str(data['id']),
+            amount=float(data['amount']),
+            currency=data.get('currency'),
+            invoice_date=data.get('invoice_date'),
+            description=data.get('description'),
+            invoice_number=data.get('invoice_number'),
+            vendor_name=data.get('vendor_name'),
+            updated_at=data.get('updated_at'),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class TransactionRecord:
+    """Bank transaction fields used for scoring"""
+    id: str
+    amount: float
+    currency: str
+    posted_at: datetime
+    description: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TransactionRecord':
+        return cls(
+            id=str(data['id']),
+            amount=float(data['amount']),
+            currency=data.get('currency'),
+            posted_at=data['posted_at'],
+            description=data.get('description'),
+            updated_at=data.get('updated_at'),
+        )
+
 
 class MatchCandidate:
-    """Represents a potential match between an invoice and bank transaction"""
+    """
+    Represents a potential match between an invoice and bank transaction
+    
+    The combined explanation string is only formatted when first read.
+    """
+    
+    __slots__ = (
+        'invoice_id',
+        'transaction_id',
+        'score',
+        'amount_score',
+        'date_score',
+        'text_score',
+        'amount_explanation',
+        'date_explanation',
+        'text_explanation',
+        '_explanation',
+    )
     
     def __init__(
         self,
@@ -18,7 +267,9 @@ class MatchCandidate:
         amount_score: float,
         date_score: float,
         text_score: float,
-        explanation: str
+        amount_explanation: str,
+        date_explanation: str,
+        text_explanation: str
     ):
         self.invoice_id = invoice_id
         self.transaction_id = transaction_id
@@ -26,7 +277,22 @@ class MatchCandidate:
         self.amount_score = amount_score
         self.date_score = date_score
         self.text_score = text_score
-        self.explanation = explanation
+        self.amount_explanation = amount_explanation
+        self.date_explanation = date_explanation
+        self.text_explanation = text_explanation
+        self._explanation = None
+
+    @property
+    def explanation(self) -> str:
+        if self._explanation is None:
+            explanation_parts = [
+                f"Amount: {self.amount_explanation}",
+                f"Date: {self.date_explanation}",
+                f"Text: {self.text_explanation}",
+                f"Overall confidence: {self.score:.1f}%"
+            ]
+            self._explanation = " | ".join(explanation_parts)
+        return self._explanation
 
 
 class ReconciliationScorer:
@@ -47,6 +313,12 @@ class ReconciliationScorer:
         text_similarity_weight: float = 0.3,
         amount_tolerance_percent: float = 2.0,
         date_proximity_days: int = 3,
+        blocking_amount_percent: float = 20.0,
+        blocking_days: int = 30,
+        min_candidate_score: float = 10.0,
+        score_cache_size: int = 100_000,
+        text_blocking_min_trigrams: int = 0,
+        fuzzy_workers: int = -1,
     ):
         self.amount_exact_weight = amount_exact_weight
         self.amount_close_weight = amount_close_weight
@@ -54,29 +326,80 @@ class ReconciliationScorer:
         self.text_similarity_weight = text_similarity_weight
         self.amount_tolerance_percent = amount_tolerance_percent
         self.date_proximity_days = date_proximity_days
+        # Pairs outside both windows (amount and date) skip fuzzy matching
+        self.blocking_amount_percent = blocking_amount_percent
+        self.blocking_days = blocking_days
+        # Pairs scoring below this are never returned as candidates
+        self.min_candidate_score = min_candidate_score
+        # Batch scoring only: pairs sharing fewer character trigrams than this
+        # skip fuzzy matching and score 0 on text (0 disables)
+        self.text_blocking_min_trigrams = text_blocking_min_trigrams
+        # Threads per batched RapidFuzz call (-1 uses every core)
+        self.fuzzy_workers = fuzzy_workers
+        
+        # Fuzzy ratios per (invoice, transaction) version, reused across
+        # reconciliation runs; only used when both sides carry updated_at
+        self.score_cache_size = score_cache_size
+        self._score_cache = LRUCache(maxsize=score_cache_size) if score_cache_size > 0 else None
+        self._score_cache_lock = threading.Lock()
 
-    def calculate_amount_score(self, invoice_amount: Decimal, transaction_amount: Decimal) -> tuple[float, str]:
+    def clear_cache(self) -> None:
+        """Reset the cached fuzzy similarity scores"""
+        _cached_partial_ratio.cache_clear()
+        _cached_text_score.cache_clear()
+        if self._score_cache is not None:
+            with self._score_cache_lock:
+                self._score_cache.clear()
+
+    def get_config(self) -> dict:
+        """Constructor arguments needed to rebuild an equivalent scorer"""
+        return {
+            'amount_exact_weight': self.amount_exact_weight,
+            'amount_close_weight': self.amount_close_weight,
+            'date_proximity_weight': self.date_proximity_weight,
+            'text_similarity_weight': self.text_similarity_weight,
+            'amount_tolerance_percent': self.amount_tolerance_percent,
+            'date_proximity_days': self.date_proximity_days,
+            'blocking_amount_percent': self.blocking_amount_percent,
+            'blocking_days': self.blocking_days,
+            'min_candidate_score': self.min_candidate_score,
+            'score_cache_size': self.score_cache_size,
+            'text_blocking_min_trigrams': self.text_blocking_min_trigrams,
+            'fuzzy_workers': self.fuzzy_workers,
+        }
+
+    def calculate_amount_score(self, invoice_amount: float, transaction_amount: float) -> tuple[float, str]:
         """
         Calculate amount matching score
         
+        Amounts are compared as integer cents and the difference is measured
+        in basis points, with the same compiled functions score_kernel uses
+        for batches.
+        
         Returns: (score, explanation)
         """
-        if invoice_amount == transaction_amount:
-            return 1.0, "Exact amount match"
-        
-        # Calculate percentage difference
-        diff = abs(invoice_amount - transaction_amount)
-        avg = (invoice_amount + transaction_amount) / 2
-        percent_diff = float((diff / avg) * 100 if avg > 0 else 100)
+        invoice_cents = _to_cents(invoice_amount)
+        transaction_cents = _to_cents(transaction_amount)
         
-        if percent_diff <= self.amount_tolerance_percent:
-            # Within tolerance - partial score
-            score = 1.0 - (percent_diff / self.amount_tolerance_percent) * 0.5
-            return score, f"Amount within {percent_diff:.1f}% tolerance"
+        if invoice_cents == transaction_cents:
+            return 1.0, self._amount_explanation(0, exact=True)
         
-        # Outside tolerance - very low score but not zero
-        score = max(0.0, 1.0 - (percent_diff / 100))
-        return score, f"Amount differs by {percent_diff:.1f}%"
+        # Difference relative to the average amount, in basis points
+        bps_diff = bps_diff_core(invoice_cents, transaction_cents)
+        score = amount_score_core(bps_diff, self._tolerance_bps)
+        return score, self._amount_explanation(bps_diff)
+
+    @property
+    def _tolerance_bps(self) -> int:
+        return round(self.amount_tolerance_percent * 100)
+
+    def _amount_explanation(self, bps_diff: int, exact: bool = False) -> str:
+        if exact:
+            return "Exact amount match"
+        percent_diff = bps_diff / 100
+        if bps_diff <= self._tolerance_bps:
+            return f"Amount within {percent_diff:.1f}% tolerance"
+        return f"Amount differs by {percent_diff:.1f}%"
 
     def calculate_date_score(
         self,
@@ -86,30 +409,42 @@ class ReconciliationScorer:
         """
         Calculate date proximity score
         
+        Dates are compared as calendar days, so timezone and time of day
+        don't matter.
+        
         Returns: (score, explanation)
         """
-        if invoice_date is None:
-            return 0.5, "Invoice date not available"
+        return self.calculate_date_score_ord(
+            invoice_date.toordinal() if invoice_date is not None else None,
+            transaction_date.toordinal()
+        )
+
+    def calculate_date_score_ord(
+        self,
+        invoice_day: Optional[int],
+        transaction_day: int
+    ) -> tuple[float, str]:
+        """
+        Calculate date proximity score from proleptic ordinals
+        (date.toordinal()), for callers that convert each row once
         
-        # Remove timezone info for comparison
-        if invoice_date.tzinfo:
-            invoice_date = invoice_date.replace(tzinfo=None)
-        if transaction_date.tzinfo:
-            transaction_date = transaction_date.replace(tzinfo=None)
+        The numeric part is date_score_core, the same compiled function
+        score_kernel uses for batches.
         
-        days_diff = abs((invoice_date - transaction_date).days)
+        Returns: (score, explanation)
+        """
+        if invoice_day is None:
+            return 0.5, self._date_explanation(None)
         
+        score = date_score_core(invoice_day, transaction_day, int(self.date_proximity_days))
+        return score, self._date_explanation(abs(invoice_day - transaction_day))
+
+    def _date_explanation(self, days_diff: Optional[int]) -> str:
+        if days_diff is None:
+            return "Invoice date not available"
         if days_diff == 0:
-            return 1.0, "Same day transaction"
-        
-        if days_diff <= self.date_proximity_days:
-            # Within proximity window - linear decay
-            score = 1.0 - (days_diff / self.date_proximity_days) * 0.5
-            return score, f"Transaction {days_diff} days from invoice date"
-        
-        # Outside window - decreasing score
-        score = max(0.0, 1.0 - (days_diff / 30))
-        return score, f"Transaction {days_diff} days from invoice date"
+            return "Same day transaction"
+        return f"Transaction {days_diff} days from invoice date"
 
     def calculate_text_score(
         self,
@@ -123,57 +458,353 @@ class ReconciliationScorer:
         
         Returns: (score, explanation)
         """
-        # Collect all text fields to compare
-        invoice_texts = []
-        if invoice_desc:
-            invoice_texts.append(invoice_desc.lower())
-        if invoice_number:
-            invoice_texts.append(invoice_number.lower())
-        if vendor_name:
-            invoice_texts.append(vendor_name.lower())
+        return _cached_text_score(invoice_desc, transaction_desc, invoice_number, vendor_name)
+
+    def _blocking_mask(
+        self,
+        bps_diffs: np.ndarray,
+        days_diffs: np.ndarray,
+        invoice_days: np.ndarray
+    ) -> np.ndarray:
+        """
+        Pairs close enough in amount or date to be worth fuzzy matching
         
-        if not transaction_desc or not invoice_texts:
-            return 0.3, "Insufficient text data for comparison"
+        Invoices without a date are only blocked on amount.
+        """
+        within_days = (days_diffs <= self.blocking_days) & (invoice_days >= 0)[:, None]
+        return (bps_diffs <= self.blocking_amount_percent * 100) | within_days
+
+    def _blocked_explanation(self, bps_diff: int, days_diff: int) -> str:
+        # days_diff is -1 when the invoice has no date
+        too_far = []
+        if bps_diff > self.blocking_amount_percent * 100:
+            too_far.append("amount")
+        if days_diff > self.blocking_days:
+            too_far.append("date")
+        return f"Not compared ({' and '.join(too_far)} too far apart)"
+
+    def _weighted_totals(
+        self,
+        amount_scores: np.ndarray,
+        date_scores: np.ndarray,
+        text_scores: np.ndarray
+    ) -> np.ndarray:
+        """Elementwise _total_score, with the same operation order as top_n_kernel"""
+        return np.minimum(100.0, (
+            amount_scores * self.amount_exact_weight +
+            date_scores * self.date_proximity_weight +
+            text_scores * self.text_similarity_weight
+        ) * 100)
+
+    def _total_score_bounds(
+        self,
+        amount_scores: np.ndarray,
+        date_scores: np.ndarray,
+        candidate_mask: np.ndarray,
+        invoice_texts: List[tuple[str, str, str]],
+        transaction_texts: List[str],
+        substring_hits: np.ndarray,
+        text_overlap: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Lowest and highest total each pair can reach before fuzzy matching
         
-        transaction_text = transaction_desc.lower()
+        Text scores lie in [0, 1] and are already settled for blocked pairs,
+        pairs without text, literal substring matches (blocked or not) and
+        (with trigram blocking) pairs outside text_overlap. Totals only grow
+        with the text score, so these bound what top_n_kernel will see.
         
-        # Calculate similarity scores
-        max_score = 0.0
-        best_match = ""
+        Returns: (lower, upper), float64 arrays of shape (N, M)
+        """
+        n, m = amount_scores.shape
+        has_invoice_text = np.fromiter((any(texts) for texts in invoice_texts), dtype=bool, count=n)
+        has_transaction_text = np.fromiter(
+            (bool(text) for text in transaction_texts), dtype=bool, count=m
+        )
         
-        for invoice_text in invoice_texts:
-            # Use fuzzy ratio
-            ratio = fuzz.partial_ratio(invoice_text, transaction_text) / 100.0
-            if ratio > max_score:
-                max_score = ratio
-                best_match = invoice_text[:50]
+        text_min = np.zeros((n, m), dtype=np.float64)
+        text_max = np.ones((n, m), dtype=np.float64)
+        settled = [] if text_overlap is None else [(~text_overlap, 0.0)]
+        settled += [
+            (~candidate_mask, BLOCKED_TEXT_SCORE),
+            (~has_invoice_text[:, None] | ~has_transaction_text[None, :], 0.3),
+            (substring_hits, 1.0),
+        ]
+        for where, value in settled:
+            text_min[where] = value
+            text_max[where] = value
         
-        # Also check if invoice number appears in transaction
-        if invoice_number and invoice_number.lower() in transaction_text:
-            max_score = max(max_score, 0.9)
-            best_match = f"Invoice number '{invoice_number}' found in description"
+        return (
+            self._weighted_totals(amount_scores, date_scores, text_min),
+            self._weighted_totals(amount_scores, date_scores, text_max),
+        )
+
+    def _could_reach_top_n(
+        self,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        candidate_mask: np.ndarray,
+        top_n: int
+    ) -> np.ndarray:
+        """
+        Pairs inside candidate_mask whose best possible total still reaches
+        min_candidate_score and their invoice's N-th best guaranteed total
         
-        # Check vendor name match
-        if vendor_name and vendor_name.lower() in transaction_text:
-            max_score = max(max_score, 0.85)
-            best_match = f"Vendor name '{vendor_name}' found in description"
+        Pairs tying that threshold may still win on transaction order, so
+        only strictly lower ones are dropped.
+        
+        Returns: bool array of shape (N, M)
+        """
+        n, m = lower.shape
+        if top_n <= 0:
+            return np.zeros((n, m), dtype=bool)
+        
+        worth = candidate_mask & (upper >= self.min_candidate_score)
+        if m > top_n:
+            threshold = np.partition(lower, m - top_n, axis=1)[:, m - top_n]
+            worth &= upper >= threshold[:, None]
+        return worth
+
+    def _most_promising(self, upper: np.ndarray, worth: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        The top_n pairs by upper bound of each invoice, within worth
+        
+        Returns: bool array of shape (N, M)
+        """
+        n, m = upper.shape
+        if m <= top_n:
+            return worth.copy()
+        
+        ranked = np.argpartition(np.where(worth, -upper, np.inf), top_n - 1, axis=1)[:, :top_n]
+        promising = np.zeros((n, m), dtype=bool)
+        promising[np.arange(n)[:, None], ranked] = True
+        return promising & worth
+
+    def _build_trigram_index(self, transaction_texts: List[str]) -> Optional[dict]:
+        """
+        Inverted index from character trigram to the transactions whose
+        description contains it, or None when trigram blocking is off
+        """
+        if self.text_blocking_min_trigrams <= 0:
+            return None
+        
+        postings = defaultdict(list)
+        for j, text in enumerate(transaction_texts):
+            for gram in _trigrams(text):
+                postings[gram].append(j)
+        return {gram: np.array(cols, dtype=np.int64) for gram, cols in postings.items()}
+
+    def _trigram_overlap(
+        self,
+        invoice_texts: List[tuple[str, str, str]],
+        trigram_index: dict,
+        n_transactions: int
+    ) -> np.ndarray:
+        """
+        Pairs where some invoice text field shares at least
+        text_blocking_min_trigrams distinct trigrams with the transaction
+        description
+        
+        Returns: bool array of shape (N, M)
+        """
+        min_shared = self.text_blocking_min_trigrams
+        overlap = np.zeros((len(invoice_texts), n_transactions), dtype=bool)
+        shared = np.empty(n_transactions, dtype=np.int32)
+        
+        for i, texts in enumerate(invoice_texts):
+            for text in texts:
+                postings = [trigram_index[gram] for gram in _trigrams(text) if gram in trigram_index]
+                if len(postings) < min_shared:
+                    continue
+                shared[:] = 0
+                for cols in postings:
+                    shared[cols] += 1
+                overlap[i] |= shared >= min_shared
+        
+        return overlap
+
+    def _substring_hit_matrices(
+        self,
+        invoice_texts: List[tuple[str, str, str]],
+        transaction_texts: List[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Literal invoice number and vendor matches for every invoice x
+        transaction pair, computed once per batch and shared by the ratio and
+        score matrices
+        
+        Returns: (number_hits, vendor_hits), bool arrays of shape (N, M)
+        """
+        shape = (len(invoice_texts), len(transaction_texts))
+        number_hits = np.zeros(shape, dtype=bool)
+        vendor_hits = np.zeros(shape, dtype=bool)
         
-        explanation = f"Text similarity: {int(max_score * 100)}%"
-        if best_match:
-            explanation += f" (matched: {best_match})"
+        for field, hits in ((1, number_hits), (2, vendor_hits)):
+            for i, texts in enumerate(invoice_texts):
+                needle = texts[field]
+                if needle:
+                    hits[i] = np.fromiter(
+                        (needle in text for text in transaction_texts),
+                        dtype=bool,
+                        count=shape[1]
+                    )
         
-        return max_score, explanation
+        return number_hits, vendor_hits
+
+    def _text_ratio_matrix(
+        self,
+        invoice_texts: List[tuple[str, str, str]],
+        transaction_texts: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        number_hits: np.ndarray,
+        vendor_hits: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute partial_ratio for every (normalized) invoice text field against
+        the lowercased transaction description of each (rows[k], cols[k]) pair,
+        in one batched RapidFuzz call per field
+        
+        Like calculate_text_score, pairs with an empty side, a literal invoice
+        number or vendor match (see _substring_hit_matrices), or whose best
+        field already scored 100 are not sent to RapidFuzz.
+        
+        Returns: uint8 array of shape (len(INVOICE_TEXT_FIELDS), N, M), zero
+        for pairs that were not compared
+        """
+        ratios = np.zeros(
+            (len(INVOICE_TEXT_FIELDS), len(invoice_texts), len(transaction_texts)),
+            dtype=np.uint8
+        )
+        
+        # Object arrays let each field's string pairs be gathered by fancy
+        # indexing, in C, instead of a Python loop over the pairs
+        transaction_array = np.array(transaction_texts, dtype=object)
+        has_transaction_text = np.array([bool(text) for text in transaction_texts], dtype=bool)
+        keep = has_transaction_text[cols]
+        rows, cols = rows[keep], cols[keep]
+        best = np.zeros(len(rows), dtype=np.uint8)
+        
+        # A substring is a partial_ratio of 100 (see _substring_ratios)
+        for field, hits in ((1, number_hits), (2, vendor_hits)):
+            hit = hits[rows, cols]
+            ratios[field, rows[hit], cols[hit]] = 100
+            best[hit] = 100
+        
+        for f in range(len(INVOICE_TEXT_FIELDS)):
+            field_array = np.array([texts[f] for texts in invoice_texts], dtype=object)
+            has_invoice_text = field_array.astype(bool)
+            
+            pending = np.flatnonzero(has_invoice_text[rows] & (best < 100))
+            if not len(pending):
+                continue
+            
+            field_ratios = process.cpdist(
+                field_array[rows[pending]],
+                transaction_array[cols[pending]],
+                scorer=fuzz.partial_ratio,
+                processor=None,
+                score_cutoff=TEXT_SCORE_CUTOFF,
+                dtype=np.uint8,
+                workers=self.fuzzy_workers,
+            )
+            ratios[f, rows[pending], cols[pending]] = field_ratios
+            best[pending] = np.maximum(best[pending], field_ratios)
+        
+        return ratios
+
+    def _cached_text_ratio_matrix(
+        self,
+        invoices: List[InvoiceRecord],
+        transactions: List[TransactionRecord],
+        invoice_texts: List[tuple[str, str, str]],
+        transaction_texts: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        number_hits: np.ndarray,
+        vendor_hits: np.ndarray
+    ) -> np.ndarray:
+        """
+        _text_ratio_matrix backed by the scorer's pair cache
+        
+        Pairs are keyed on both ids and updated_at timestamps (plus the vendor
+        name, which lives outside the invoice row), so a re-run only fuzzy
+        matches new or changed rows.
+        """
+        if self._score_cache is None:
+            return self._text_ratio_matrix(
+                invoice_texts, transaction_texts, rows, cols, number_hits, vendor_hits
+            )
+        
+        keys = [
+            (inv.id, txn.id, inv.updated_at, txn.updated_at, inv.vendor_name)
+            if inv.updated_at is not None and txn.updated_at is not None else None
+            for inv, txn in ((invoices[i], transactions[j]) for i, j in zip(rows, cols))
+        ]
+        
+        with self._score_cache_lock:
+            cached = [self._score_cache.get(key) if key is not None else None for key in keys]
+        
+        miss = np.array([value is None for value in cached], dtype=bool)
+        ratios = self._text_ratio_matrix(
+            invoice_texts, transaction_texts, rows[miss], cols[miss], number_hits, vendor_hits
+        )
+        
+        for k in np.flatnonzero(~miss):
+            ratios[:, rows[k], cols[k]] = cached[k]
+        
+        with self._score_cache_lock:
+            for k in np.flatnonzero(miss):
+                if keys[k] is not None:
+                    self._score_cache[keys[k]] = tuple(ratios[:, rows[k], cols[k]].tolist())
+        
+        return ratios
+
+    def _text_score_matrix(
+        self,
+        invoice_texts: List[tuple[str, str, str]],
+        transaction_texts: List[str],
+        ratios: np.ndarray,
+        candidate_mask: np.ndarray,
+        number_hits: np.ndarray,
+        vendor_hits: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized _resolve_text_score over the output of _text_ratio_matrix;
+        pairs outside candidate_mask without a substring match get
+        BLOCKED_TEXT_SCORE
+        
+        Returns: float64 array of shape (N, M)
+        """
+        present = np.array(
+            [[bool(text) for text in texts] for texts in invoice_texts],
+            dtype=bool
+        ).reshape(len(invoice_texts), len(INVOICE_TEXT_FIELDS)).T
+        
+        scores = np.where(present[:, :, None], ratios, 0).max(axis=0) / 100.0
+        
+        # Substring bonuses
+        for hits, bonus in ((number_hits, 0.9), (vendor_hits, 0.85)):
+            scores[hits] = np.maximum(scores[hits], bonus)
+        
+        # Insufficient text data
+        scores[~present.any(axis=0), :] = 0.3
+        scores[:, np.array([not text for text in transaction_texts], dtype=bool)] = 0.3
+        
+        scores[~candidate_mask & ~number_hits & ~vendor_hits] = BLOCKED_TEXT_SCORE
+        
+        return scores
 
     def score_match(
         self,
         invoice_id: str,
-        invoice_amount: Decimal,
+        invoice_amount: float,
         invoice_date: Optional[datetime],
         invoice_desc: Optional[str],
         invoice_number: Optional[str],
         vendor_name: Optional[str],
         transaction_id: str,
-        transaction_amount: Decimal,
+        transaction_amount: float,
         transaction_date: datetime,
         transaction_desc: Optional[str],
     ) -> MatchCandidate:
@@ -182,20 +813,50 @@ class ReconciliationScorer:
         
         Returns: MatchCandidate with score and explanation
         """
+        # Currency isn't part of the pair score; callers only pair matching ones
+        return self._score_pair(
+            InvoiceRecord(
+                invoice_id, invoice_amount, None, invoice_date,
+                invoice_desc, invoice_number, vendor_name,
+            ),
+            TransactionRecord(
+                transaction_id, transaction_amount, None, transaction_date, transaction_desc,
+            ),
+        )
+
+    def _score_pair(self, invoice: InvoiceRecord, transaction: TransactionRecord) -> MatchCandidate:
+        """Score one invoice against one transaction, reading each field once"""
+        invoice_date = invoice.invoice_date
+        
         # Calculate component scores
         amount_score, amount_explanation = self.calculate_amount_score(
-            invoice_amount, transaction_amount
+            invoice.amount, transaction.amount
         )
         
-        date_score, date_explanation = self.calculate_date_score(
-            invoice_date, transaction_date
+        date_score, date_explanation = self.calculate_date_score_ord(
+            invoice_date.toordinal() if invoice_date is not None else None,
+            transaction.posted_at.toordinal()
         )
         
-        text_score, text_explanation = self.calculate_text_score(
-            invoice_desc, transaction_desc, invoice_number, vendor_name
+        text_score, text_explanation = _cached_text_score(
+            invoice.description,
+            transaction.description,
+            invoice.invoice_number,
+            invoice.vendor_name
         )
         
-        # Calculate weighted total score
+        return self._build_candidate(
+            invoice.id,
+            transaction.id,
+            amount_score, amount_explanation,
+            date_score, date_explanation,
+            text_score, text_explanation,
+        )
+
+    def _total_score(self, amount_score: float, date_score: float, text_score: float) -> float:
+        """
+        Weighted total on the 0-100 scale (top_n_kernel repeats this inline)
+        """
         # Amount matching is most important, then date, then text
         total_score = (
             amount_score * self.amount_exact_weight +
@@ -204,22 +865,26 @@ class ReconciliationScorer:
         )
         
         # Normalize to 0-100 scale
-        total_score = min(100.0, total_score * 100)
-        
-        # Build explanation
-        explanation_parts = [
-            f"Amount: {amount_explanation}",
-            f"Date: {date_explanation}",
-            f"Text: {text_explanation}",
-            f"Overall confidence: {total_score:.1f}%"
-        ]
-        
-        explanation = " | ".join(explanation_parts)
+        return min(100.0, total_score * 100)
+
+    def _build_candidate(
+        self,
+        invoice_id: str,
+        transaction_id: str,
+        amount_score: float,
+        amount_explanation: str,
+        date_score: float,
+        date_explanation: str,
+        text_score: float,
+        text_explanation: str,
+    ) -> MatchCandidate:
+        total_score = self._total_score(amount_score, date_score, text_score)
         
-        logger.debug(
-            f"Scored match: Invoice {invoice_id[:8]} <-> Transaction {transaction_id[:8]} "
-            f"= {total_score:.1f} (amount: {amount_score:.2f}, date: {date_score:.2f}, text: {text_score:.2f})"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Scored match: Invoice {invoice_id[:8]} <-> Transaction {transaction_id[:8]} "
+                f"= {total_score:.1f} (amount: {amount_score:.2f}, date: {date_score:.2f}, text: {text_score:.2f})"
+            )
         
         return MatchCandidate(
             invoice_id=invoice_id,
@@ -228,57 +893,355 @@ class ReconciliationScorer:
             amount_score=amount_score * 100,
             date_score=date_score * 100,
             text_score=text_score * 100,
-            explanation=explanation
+            amount_explanation=amount_explanation,
+            date_explanation=date_explanation,
+            text_explanation=text_explanation
         )
 
     def score_candidates(
         self,
-        invoices: List[dict],
-        transactions: List[dict],
+        invoices: List[Union[InvoiceRecord, dict]],
+        transactions: List[Union[TransactionRecord, dict]],
         top_n: int = 5
     ) -> List[MatchCandidate]:
         """
         Score all possible matches and return top N candidates
         
+        Invoices and transactions are bucketed by currency first, so only
+        same-currency pairs are ever compared.
+        
         Args:
-            invoices: List of invoice dicts
-            transactions: List of transaction dicts
+            invoices: List of InvoiceRecord objects (or invoice dicts)
+            transactions: List of TransactionRecord objects (or transaction dicts)
             top_n: Number of top matches to return per invoice
             
         Returns: List of MatchCandidate objects sorted by score
         """
-        all_candidates = []
+        # top_n comes straight from the API; a negative value means none
+        top_n = max(int(top_n), 0)
+        batches = []
         
-        for invoice in invoices:
-            invoice_candidates = []
+        invoices_by_currency = defaultdict(list)
+        positions_by_currency = defaultdict(list)
+        for position, invoice in enumerate(invoices):
+            currency = _currency_of(invoice)
+            invoices_by_currency[currency].append(invoice)
+            positions_by_currency[currency].append(position)
+        
+        transactions_by_currency = defaultdict(list)
+        for transaction in transactions:
+            transactions_by_currency[_currency_of(transaction)].append(transaction)
+        
+        for currency, currency_invoices in invoices_by_currency.items():
+            currency_transactions = transactions_by_currency.get(currency)
+            if not currency_transactions:
+                continue
             
-            for transaction in transactions:
-                # Skip if currencies don't match
-                if invoice.get('currency') != transaction.get('currency'):
-                    continue
-                
-                candidate = self.score_match(
-                    invoice_id=str(invoice['id']),
-                    invoice_amount=Decimal(str(invoice['amount'])),
-                    invoice_date=invoice.get('invoice_date'),
-                    invoice_desc=invoice.get('description'),
-                    invoice_number=invoice.get('invoice_number'),
-                    vendor_name=invoice.get('vendor_name'),
-                    transaction_id=str(transaction['id']),
-                    transaction_amount=Decimal(str(transaction['amount'])),
-                    transaction_date=transaction['posted_at'],
-                    transaction_desc=transaction.get('description'),
-                )
-                
-                invoice_candidates.append(candidate)
+            # Rows are only converted once their currency has a counterpart
+            currency_invoices = [
+                invoice if isinstance(invoice, InvoiceRecord) else InvoiceRecord.from_dict(invoice)
+                for invoice in currency_invoices
+            ]
+            currency_transactions = [
+                transaction if isinstance(transaction, TransactionRecord)
+                else TransactionRecord.from_dict(transaction)
+                for transaction in currency_transactions
+            ]
             
-            # Sort by score and take top N for this invoice
-            invoice_candidates.sort(key=lambda x: x.score, reverse=True)
-            all_candidates.extend(invoice_candidates[:top_n])
+            batches.extend(self._score_currency_bucket(
+                currency_invoices,
+                np.array(positions_by_currency[currency], dtype=np.int64),
+                currency_transactions,
+                top_n
+            ))
         
-        # Sort all candidates by score
-        all_candidates.sort(key=lambda x: x.score, reverse=True)
+        # Rank the winners of every bucket by score on the arrays, then build
+        # MatchCandidate objects in that order. Ties go by input invoice order,
+        # then by rank within the invoice (each batch's own order).
+        all_candidates = []
+        if batches:
+            scores = np.concatenate([batch.scores for batch in batches])
+            positions = np.concatenate([batch.invoice_positions for batch in batches])
+            batch_of = np.repeat(np.arange(len(batches)), [len(batch.scores) for batch in batches])
+            offsets = np.cumsum([0] + [len(batch.scores) for batch in batches])
+            
+            for k in np.lexsort((positions, -scores)).tolist():
+                b = int(batch_of[k])
+                all_candidates.append(self._candidate_from_batch(batches[b], k - int(offsets[b])))
         
         logger.info(f"Generated {len(all_candidates)} match candidates")
         
-        return all_candidates
\ No newline at end of file
+        return all_candidates
+
+    def _score_currency_bucket(
+        self,
+        invoices: List[InvoiceRecord],
+        invoice_positions: np.ndarray,
+        transactions: List[TransactionRecord],
+        top_n: int
+    ) -> List['_ScoredBatch']:
+        """
+        Score invoices against transactions that share their currency
+        
+        Everything past the transaction columns is per invoice (blocking,
+        score bounds, top N), so invoices are scored in tiles of about
+        SCORE_TILE_PAIRS pairs with the same result as one big matrix.
+        invoice_positions holds each invoice's index in the score_candidates
+        input, which orders ties across buckets.
+        
+        Returns: one _ScoredBatch per tile, in invoice order
+        """
+        # Fill the column arrays straight from the records, without an
+        # intermediate list per column
+        n_transactions = len(transactions)
+        
+        transaction_cents = np.fromiter(
+            (_to_cents(t.amount) for t in transactions), dtype=np.int64, count=n_transactions
+        )
+        transaction_days = np.fromiter(
+            (t.posted_at.toordinal() for t in transactions),
+            dtype=np.int64,
+            count=n_transactions
+        )
+        
+        # Normalize text once per row rather than once per pair
+        transaction_texts = [(t.description or '').lower() for t in transactions]
+        trigram_index = self._build_trigram_index(transaction_texts)
+        
+        tile_rows = max(1, SCORE_TILE_PAIRS // max(n_transactions, 1))
+        return [
+            self._score_invoice_tile(
+                invoices[start:start + tile_rows],
+                invoice_positions[start:start + tile_rows],
+                transactions,
+                transaction_cents,
+                transaction_days,
+                transaction_texts,
+                trigram_index,
+                top_n
+            )
+            for start in range(0, len(invoices), tile_rows)
+        ]
+
+    def _score_invoice_tile(
+        self,
+        invoices: List[InvoiceRecord],
+        invoice_positions: np.ndarray,
+        transactions: List[TransactionRecord],
+        transaction_cents: np.ndarray,
+        transaction_days: np.ndarray,
+        transaction_texts: List[str],
+        trigram_index: Optional[dict],
+        top_n: int
+    ) -> '_ScoredBatch':
+        """
+        Score a run of invoices against all transactions of their currency
+        
+        Amount and date scores for the whole invoice x transaction matrix come
+        from one compiled kernel and text scores from batched RapidFuzz calls;
+        a second kernel fuses the weighted total with top-N selection. Only
+        those winners are kept, as parallel arrays.
+        """
+        n_invoices = len(invoices)
+        
+        invoice_cents = np.fromiter(
+            (_to_cents(i.amount) for i in invoices), dtype=np.int64, count=n_invoices
+        )
+        invoice_days = np.fromiter(
+            (i.invoice_date.toordinal() if i.invoice_date else -1 for i in invoices),
+            dtype=np.int64,
+            count=n_invoices
+        )
+        invoice_texts = [
+            _normalize_invoice_texts(i.description, i.invoice_number, i.vendor_name)
+            for i in invoices
+        ]
+        
+        amount_scores, bps_diffs, date_scores, days_diffs = score_kernel(
+            invoice_cents,
+            transaction_cents,
+            invoice_days,
+            transaction_days,
+            self._tolerance_bps,
+            int(self.date_proximity_days),
+        )
+        
+        # Only fuzzy-match pairs that are plausible on amount or date, in one
+        # native call instead of one per pair
+        candidate_mask = self._blocking_mask(bps_diffs, days_diffs, invoice_days)
+        
+        # Literal matches are checked for every pair (a substring test, not a
+        # fuzzy match), so blocked pairs keep the invoice number and vendor
+        # bonuses and score as in score_match
+        number_hits, vendor_hits = self._substring_hit_matrices(invoice_texts, transaction_texts)
+        substring_hits = number_hits | vendor_hits
+        
+        # Optionally, only pairs with some trigram overlap are fuzzy matched
+        if trigram_index is None:
+            text_overlap = None
+            matchable = candidate_mask | substring_hits
+        else:
+            text_overlap = self._trigram_overlap(invoice_texts, trigram_index, len(transactions))
+            matchable = (candidate_mask & text_overlap) | substring_hits
+        
+        # Of those, skip pairs that can't reach their invoice's top N even
+        # with a perfect text score. Fuzzy matching the most promising pairs
+        # first turns their bounds into exact totals, which usually lifts
+        # each invoice's threshold enough to drop most of the rest.
+        lower, upper = self._total_score_bounds(
+            amount_scores, date_scores, candidate_mask,
+            invoice_texts, transaction_texts, substring_hits, text_overlap
+        )
+        worth = self._could_reach_top_n(lower, upper, matchable, top_n)
+        
+        promising = self._most_promising(upper, worth, top_n)
+        rows, cols = np.nonzero(promising)
+        ratios = self._cached_text_ratio_matrix(
+            invoices, transactions, invoice_texts, transaction_texts, rows, cols,
+            number_hits, vendor_hits
+        )
+        
+        # Pairs not matched yet have ratios of 0, which only lowers their
+        # totals; the promising pairs' totals are now exact
+        totals = self._weighted_totals(
+            amount_scores,
+            date_scores,
+            self._text_score_matrix(
+                invoice_texts, transaction_texts, ratios, candidate_mask, number_hits, vendor_hits
+            )
+        )
+        lower = np.where(promising, totals, lower)
+        remaining = self._could_reach_top_n(lower, upper, matchable, top_n) & ~promising
+        
+        rows, cols = np.nonzero(remaining)
+        np.maximum(ratios, self._cached_text_ratio_matrix(
+            invoices, transactions, invoice_texts, transaction_texts, rows, cols,
+            number_hits, vendor_hits
+        ), out=ratios)
+        
+        text_scores = self._text_score_matrix(
+            invoice_texts, transaction_texts, ratios, candidate_mask, number_hits, vendor_hits
+        )
+        
+        # Take top N for each invoice without materializing the total matrix
+        top_idx, top_scores = top_n_kernel(
+            amount_scores,
+            date_scores,
+            text_scores,
+            float(self.amount_exact_weight),
+            float(self.date_proximity_weight),
+            float(self.text_similarity_weight),
+            float(self.min_candidate_score),
+            top_n,
+        )
+        
+        # Unused slots (-1) only trail each row, so this is invoice order and
+        # then rank within the invoice
+        inv_idx, slot = np.nonzero(top_idx >= 0)
+        txn_idx = top_idx[inv_idx, slot]
+        
+        return _ScoredBatch(
+            invoices=invoices,
+            transactions=transactions,
+            invoice_texts=invoice_texts,
+            transaction_texts=transaction_texts,
+            invoice_idx=inv_idx,
+            transaction_idx=txn_idx,
+            invoice_positions=invoice_positions[inv_idx],
+            scores=top_scores[inv_idx, slot],
+            amount_scores=amount_scores[inv_idx, txn_idx],
+            bps_diffs=bps_diffs[inv_idx, txn_idx],
+            exact_amounts=invoice_cents[inv_idx] == transaction_cents[txn_idx],
+            date_scores=date_scores[inv_idx, txn_idx],
+            days_diffs=np.where(invoice_days[inv_idx] >= 0, days_diffs[inv_idx, txn_idx], -1),
+            text_scores=text_scores[inv_idx, txn_idx],
+            ratios=ratios[:, inv_idx, txn_idx],
+            compared=(candidate_mask | substring_hits)[inv_idx, txn_idx],
+        )
+
+    def _candidate_from_batch(self, batch: '_ScoredBatch', k: int) -> MatchCandidate:
+        """Build the MatchCandidate for the k-th pair of a scored batch"""
+        i = int(batch.invoice_idx[k])
+        j = int(batch.transaction_idx[k])
+        invoice = batch.invoices[i]
+        
+        if batch.compared[k]:
+            _, text_explanation = _resolve_text_score(
+                batch.ratios[:, k],
+                batch.invoice_texts[i],
+                batch.transaction_texts[j],
+                invoice.invoice_number,
+                invoice.vendor_name,
+            )
+        else:
+            text_explanation = self._blocked_explanation(
+                int(batch.bps_diffs[k]), int(batch.days_diffs[k])
+            )
+        
+        days_diff = int(batch.days_diffs[k])
+        
+        return self._build_candidate(
+            invoice.id,
+            batch.transactions[j].id,
+            float(batch.amount_scores[k]),
+            self._amount_explanation(int(batch.bps_diffs[k]), exact=bool(batch.exact_amounts[k])),
+            float(batch.date_scores[k]),
+            self._date_explanation(days_diff if days_diff >= 0 else None),
+            float(batch.text_scores[k]),
+            text_explanation,
+        )
+
+
+class _ScoredBatch(NamedTuple):
+    """
+    Top-N pairs of one currency bucket as parallel arrays (one entry per pair)
+    
+    Keeps what _candidate_from_batch needs, so MatchCandidate objects and
+    their explanations are only built for the pairs that are returned.
+    """
+    invoices: List[InvoiceRecord]
+    transactions: List[TransactionRecord]
+    invoice_texts: List[tuple[str, str, str]]
+    transaction_texts: List[str]
+    invoice_idx: np.ndarray
+    transaction_idx: np.ndarray
+    # Index of each pair's invoice in the score_candidates input
+    invoice_positions: np.ndarray
+    scores: np.ndarray
+    amount_scores: np.ndarray
+    bps_diffs: np.ndarray
+    exact_amounts: np.ndarray
+    date_scores: np.ndarray
+    # -1 when the invoice has no date
+    days_diffs: np.ndarray
+    text_scores: np.ndarray
+    # partial_ratio per INVOICE_TEXT_FIELDS entry, shape (3, K)
+    ratios: np.ndarray
+    # False for pairs pruned by the blocking mask (and without a literal
+    # invoice number or vendor match)
+    compared: np.ndarray
+
+
+# Scorers built inside process-pool workers, keyed by their config so the
+# ratio cache survives between batches sent to the same worker
+_worker_scorers: dict = {}
+
+
+def _score_worker(
+    config: dict,
+    invoices: List[InvoiceRecord],
+    transactions: List[TransactionRecord],
+    top_n: int = 5
+) -> List[MatchCandidate]:
+    """
+    Score a batch in a worker process
+    
+    Module-level so ProcessPoolExecutor can pickle it by reference; the
+    scorer is rebuilt from its config rather than shipped across processes.
+    """
+    key = tuple(sorted(config.items()))
+    scorer = _worker_scorers.get(key)
+    if scorer is None:
+        scorer = ReconciliationScorer(**config)
+        _worker_scorers[key] = scorer
+    return scorer.score_candidates(invoices, transactions, top_n)
@@ -0,0 +1,165 @@
+"""
+Numba kernels for the numeric part of ReconciliationScorer
+
+The kernels mirror calculate_amount_score / calculate_date_score exactly
+(same branches, same integer and float64 arithmetic) so batch and
+single-pair scoring agree.
+
+Every kernel carries an explicit signature, so it is compiled (or loaded
+from the on-disk cache) when this module is imported rather than on the
+first scoring request.
+"""
+import os
+
+import numpy as np
+from numba import config, float64, int64, njit, prange
+
+# score_kernel is launched from asyncio.to_thread workers; prefer the OpenMP
+# threading layer, which is thread-safe and (unlike TBB) doesn't hang
+# interpreter shutdown after a launch from a non-main thread
+if 'NUMBA_THREADING_LAYER_PRIORITY' not in os.environ:
+    config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+
+
+@njit(int64(int64, int64), cache=True, nogil=True)
+def bps_diff_core(inv_cents, txn_cents):
+    """
+    Amount difference in basis points of the average of two cent amounts
+    
+    floor(diff * 20000 / total), worked out in steps so no intermediate
+    overflows int64 for any amount a DECIMAL(15, 2) column holds; diff * 20000
+    itself overflows once diff passes about 4.6e14 cents.
+    """
+    diff = abs(inv_cents - txn_cents)
+    if diff == 0:
+        return 0
+    total = inv_cents + txn_cents
+    if total <= 0:
+        return 10000
+    rem = diff % total * 100
+    return (diff // total * 20000
+            + rem // total * 200
+            + rem % total * 200 // total)
+
+
+@njit(float64(int64, int64), cache=True, nogil=True)
+def amount_score_core(bps_diff, tol_bps):
+    """Amount score for a basis-point difference"""
+    if tol_bps > 0 and bps_diff <= tol_bps:
+        # Within tolerance - partial score
+        return 1.0 - (bps_diff / tol_bps) * 0.5
+    # Outside tolerance - very low score but not zero
+    return max(0.0, 1.0 - (bps_diff / 10000))
+
+
+@njit(float64(int64, int64, int64), cache=True, nogil=True)
+def date_score_core(inv_day, txn_day, prox_days):
+    """Date proximity score for two proleptic ordinals"""
+    days_diff = abs(inv_day - txn_day)
+    if days_diff == 0:
+        return 1.0
+    if days_diff <= prox_days:
+        # Within proximity window - linear decay
+        return 1.0 - (days_diff / prox_days) * 0.5
+    # Outside window - decreasing score
+    return max(0.0, 1.0 - (days_diff / 30))
+
+
+@njit(
+    [(int64[:], int64[:], int64[:], int64[:], int64, int64)],
+    cache=True,
+    parallel=True,
+    nogil=True,
+)
+def score_kernel(inv_cents, txn_cents, inv_days, txn_days, tol_bps, prox_days):
+    """
+    Amount and date scores for every invoice x transaction pair
+    
+    Amounts are int64 cents and the amount difference is measured in integer
+    basis points of the average amount, so all arithmetic up to the final
+    score is exact. inv_days/txn_days are proleptic ordinals; invoices
+    without a date are marked with -1 and get the neutral 0.5 date score.
+    
+    Returns: (amount_scores, bps_diffs, date_scores, days_diffs), each of
+    shape (N, M)
+    """
+    n = inv_cents.shape[0]
+    m = txn_cents.shape[0]
+    
+    amount_scores = np.empty((n, m), dtype=np.float64)
+    bps_diffs = np.empty((n, m), dtype=np.int64)
+    date_scores = np.empty((n, m), dtype=np.float64)
+    days_diffs = np.empty((n, m), dtype=np.int64)
+    
+    for i in prange(n):
+        for j in range(m):
+            # Amount
+            bps_diff = bps_diff_core(inv_cents[i], txn_cents[j])
+            amount_scores[i, j] = amount_score_core(bps_diff, tol_bps)
+            bps_diffs[i, j] = bps_diff
+            
+            # Date
+            days_diff = abs(inv_days[i] - txn_days[j])
+            if inv_days[i] < 0:
+                date_score = 0.5
+            else:
+                date_score = date_score_core(inv_days[i], txn_days[j], prox_days)
+            
+            date_scores[i, j] = date_score
+            days_diffs[i, j] = days_diff
+    
+    return amount_scores, bps_diffs, date_scores, days_diffs
+
+
+@njit(
+    [(float64[:, :], float64[:, :], float64[:, :], float64, float64, float64, float64, int64)],
+    cache=True,
+    parallel=True,
+    nogil=True,
+)
+def top_n_kernel(amount_scores, date_scores, text_scores, w_amt, w_date, w_text, min_score, top_n):
+    """
+    Weighted total score plus per-invoice top-N selection in one pass
+    
+    Each row keeps a small sorted buffer instead of materializing and
+    partitioning the full total-score matrix. Ties keep transaction order and
+    totals below min_score are dropped.
+    
+    Returns: (top_idx, top_scores), each of shape (N, top_n); unused slots
+    have index -1
+    """
+    n, m = amount_scores.shape
+    
+    top_idx = np.full((n, top_n), -1, dtype=np.int64)
+    top_scores = np.full((n, top_n), -np.inf, dtype=np.float64)
+    if top_n == 0:
+        return top_idx, top_scores
+    
+    for i in prange(n):
+        filled = 0
+        for j in range(m):
+            total = (
+                amount_scores[i, j] * w_amt +
+                date_scores[i, j] * w_date +
+                text_scores[i, j] * w_text
+            )
+            total = min(100.0, total * 100)
+            
+            if total < min_score:
+                continue
+            if filled == top_n and total <= top_scores[i, top_n - 1]:
+                continue
+            
+            # Insert after any equal scores so earlier transactions win ties
+            k = filled if filled < top_n else top_n - 1
+            while k > 0 and top_scores[i, k - 1] < total:
+                top_scores[i, k] = top_scores[i, k - 1]
+                top_idx[i, k] = top_idx[i, k - 1]
+                k -= 1
+            top_scores[i, k] = total
+            top_idx[i, k] = j
+            
+            if filled < top_n:
+                filled += 1
+    
+    return top_idx, top_scores
@@ -2,12 +2,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
 from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import multiprocessing
 import os
 from dotenv import load_dotenv
 
 from app.schema import schema
-from app.engine.scorer import ReconciliationScorer
 from app.database import engine, Base
 
 # Load environment variables
@@ -21,40 +22,94 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """
-    Lifespan context manager for startup/shutdown events
+def create_scorer():
     """
-    # Startup
-    logger.info("Starting Python Reconciliation Engine...")
+    Build the scorer from environment variables
     
-    # Create database tables (if not exists)
-    # Note: In production, use Alembic migrations
-    try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables verified")
-    except Exception as e:
-        logger.error(f"Database initialization error: {e}")
+    Imported here so a cold worker doesn't pay for loading (and JIT
+    compiling) the scoring engine until the first request needs it.
+    """
+    from app.engine.scorer import ReconciliationScorer
     
-    # Initialize scorer with environment variables
-    scorer = ReconciliationScorer(
+    return ReconciliationScorer(
         amount_exact_weight=float(os.getenv('AMOUNT_EXACT_WEIGHT', 0.4)),
         amount_close_weight=float(os.getenv('AMOUNT_CLOSE_WEIGHT', 0.2)),
         date_proximity_weight=float(os.getenv('DATE_PROXIMITY_WEIGHT', 0.3)),
         text_similarity_weight=float(os.getenv('TEXT_SIMILARITY_WEIGHT', 0.3)),
         amount_tolerance_percent=float(os.getenv('AMOUNT_TOLERANCE_PERCENT', 2.0)),
         date_proximity_days=int(os.getenv('DATE_PROXIMITY_DAYS', 3)),
+        blocking_amount_percent=float(os.getenv('BLOCKING_AMOUNT_PERCENT', 20.0)),
+        blocking_days=int(os.getenv('BLOCKING_DAYS', 30)),
+        min_candidate_score=float(os.getenv('MIN_CANDIDATE_SCORE', 10.0)),
+        score_cache_size=int(os.getenv('SCORE_CACHE_SIZE', 100_000)),
+        text_blocking_min_trigrams=int(os.getenv('TEXT_BLOCKING_MIN_TRIGRAMS', 0)),
     )
+
+
+def _init_score_worker():
+    """
+    Process-pool initializer
+    
+    The pool already runs a worker per core, so each worker keeps Numba to
+    one thread instead of starting a full prange team of its own. The
+    kernels module is imported first so its threading layer choice applies.
+    """
+    from numba import set_num_threads
+    
+    from app.engine import scorer_kernels  # noqa: F401
+    
+    set_num_threads(1)
+
+
+def get_scorer():
+    """Return the shared scorer, creating it on first use"""
+    scorer = getattr(app.state, 'scorer', None)
+    if scorer is None:
+        scorer = create_scorer()
+        app.state.scorer = scorer
+        logger.info("Reconciliation scorer initialized")
+    return scorer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Lifespan context manager for startup/shutdown events
+    """
+    # Startup
+    logger.info("Starting Python Reconciliation Engine...")
+    
+    # Tables are managed by Alembic migrations (alembic upgrade head);
+    # AUTO_CREATE_TABLES=true creates missing ones for local development
+    if os.getenv('AUTO_CREATE_TABLES', 'false').lower() == 'true':
+        try:
+            Base.metadata.create_all(bind=engine)
+            logger.info("Database tables verified")
+        except Exception as e:
+            logger.error(f"Database initialization error: {e}")
+    
+    # Very large batches are scored in worker processes so one tenant's
+    # reconciliation doesn't hold the GIL for everyone else
+    workers = int(os.getenv('PROCESS_POOL_WORKERS', os.cpu_count() or 1))
+    if workers > 0:
+        # spawn rather than fork: the parent may already run OpenMP threads
+        app.state.process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_score_worker,
+        )
+        logger.info(f"Scoring process pool started with {workers} workers")
     
-    app.state.scorer = scorer
-    logger.info("Reconciliation scorer initialized")
     logger.info(f"Server starting on {os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 8000)}")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Python Reconciliation Engine...")
+    process_pool = getattr(app.state, 'process_pool', None)
+    if process_pool is not None:
+        process_pool.shutdown(cancel_futures=True)
+        app.state.process_pool = None
 
 
 # Create FastAPI app
@@ -79,7 +134,9 @@ app.add_middleware(
 async def get_context():
     """Inject dependencies into GraphQL context"""
     return {
-        "scorer": app.state.scorer,
+        "scorer": get_scorer(),
+        "process_pool": getattr(app.state, 'process_pool', None),
+        "process_pool_threshold": int(os.getenv('PROCESS_POOL_THRESHOLD', 100_000)),
     }
 
 
@@ -114,7 +171,7 @@ async def health():
 @app.get("/config")
 async def config():
     """Display current configuration (for debugging)"""
-    scorer: ReconciliationScorer = app.state.scorer
+    scorer = get_scorer()
     return {
         "scoring_weights": {
             "amount_exact": scorer.amount_exact_weight,
@@ -125,6 +182,19 @@ async def config():
         "tolerances": {
             "amount_tolerance_percent": scorer.amount_tolerance_percent,
             "date_proximity_days": scorer.date_proximity_days,
+            "min_candidate_score": scorer.min_candidate_score,
+        },
+        "blocking": {
+            "blocking_amount_percent": scorer.blocking_amount_percent,
+            "blocking_days": scorer.blocking_days,
+            "text_blocking_min_trigrams": scorer.text_blocking_min_trigrams,
+        },
+        "cache": {
+            "score_cache_size": scorer.score_cache_size,
+        },
+        "process_pool": {
+            "enabled": getattr(app.state, 'process_pool', None) is not None,
+            "threshold": int(os.getenv('PROCESS_POOL_THRESHOLD', 100_000)),
         }
     }
 
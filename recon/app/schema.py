@@ -1,3 +1,4 @@
+import asyncio
 import strawberry
 from typing import List, Optional
 from datetime import datetime
@@ -26,6 +27,7 @@ class InvoiceInput:
     description: Optional[str] = None
     invoice_number: Optional[str] = None
     vendor_name: Optional[str] = None
+    updated_at: Optional[datetime] = None
 
 
 @strawberry.input
@@ -36,6 +38,7 @@ class TransactionInput:
     currency: str
     posted_at: datetime
     description: Optional[str] = None
+    updated_at: Optional[datetime] = None
 
 
 @strawberry.input
@@ -85,7 +88,12 @@ class Mutation:
         applies deterministic scoring heuristics, and returns ranked match candidates.
         """
         import time
-        from app.engine.scorer import ReconciliationScorer
+        from app.engine.scorer import (
+            ReconciliationScorer,
+            InvoiceRecord,
+            TransactionRecord,
+            _score_worker,
+        )
         
         start_time = time.time()
         
@@ -96,37 +104,59 @@ class Mutation:
             # Fallback: create scorer with default settings
             scorer = ReconciliationScorer()
         
-        # Convert input to dict format for scorer
+        # Convert input to the scorer's slotted records in one pass
         invoices = [
-            {
-                'id': inv.id,
-                'amount': inv.amount,
-                'currency': inv.currency,
-                'invoice_date': inv.invoice_date,
-                'description': inv.description,
-                'invoice_number': inv.invoice_number,
-                'vendor_name': inv.vendor_name,
-            }
+            InvoiceRecord(
+                inv.id,
+                float(inv.amount),
+                inv.currency,
+                inv.invoice_date,
+                inv.description,
+                inv.invoice_number,
+                inv.vendor_name,
+                inv.updated_at,
+            )
             for inv in input.invoices
         ]
         
         transactions = [
-            {
-                'id': txn.id,
-                'amount': txn.amount,
-                'currency': txn.currency,
-                'posted_at': txn.posted_at,
-                'description': txn.description,
-            }
+            TransactionRecord(
+                txn.id,
+                float(txn.amount),
+                txn.currency,
+                txn.posted_at,
+                txn.description,
+                txn.updated_at,
+            )
             for txn in input.transactions
         ]
         
-        # Score candidates
-        candidates = scorer.score_candidates(
-            invoices=invoices,
-            transactions=transactions,
-            top_n=input.top_n
-        )
+        # Score candidates off the event loop so other requests keep being served;
+        # RapidFuzz and the Numba kernel release the GIL while they run.
+        # Very large batches go to the process pool, where the scorer is
+        # rebuilt from its config; small ones aren't worth the pickling.
+        # Pool workers fuzzy match on one thread each (the pool is the
+        # parallelism), like their Numba kernels.
+        process_pool = info.context.get("process_pool")
+        threshold = info.context.get("process_pool_threshold", 100_000)
+        
+        if process_pool is not None and len(invoices) * len(transactions) > threshold:
+            loop = asyncio.get_running_loop()
+            candidates = await loop.run_in_executor(
+                process_pool,
+                _score_worker,
+                {**scorer.get_config(), 'fuzzy_workers': 1},
+                invoices,
+                transactions,
+                input.top_n
+            )
+        else:
+            candidates = await asyncio.to_thread(
+                scorer.score_candidates,
+                invoices,
+                transactions,
+                input.top_n
+            )
         
         # Convert to GraphQL types
         candidate_types = [
@@ -1,6 +1,11 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
 from httpx import AsyncClient
-from app.main import app
+from numba import get_num_threads
+
+from app.main import _init_score_worker, app
 
 
 @pytest.mark.asyncio
@@ -96,4 +101,100 @@ async def test_score_candidates_mutation():
     result = data["data"]["scoreCandidates"]
     assert len(result["candidates"]) > 0
     assert result["candidates"][0]["score"] > 0
-    assert result["totalProcessed"] == 1
\ No newline at end of file
+    assert result["totalProcessed"] == 1
+
+
+class CountingPool(ProcessPoolExecutor):
+    """Single-worker scoring pool that counts the batches sent to it"""
+    
+    def __init__(self):
+        super().__init__(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_score_worker,
+        )
+        self.submitted = 0
+    
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    pool = CountingPool()
+    yield pool
+    pool.shutdown()
+
+
+def test_process_pool_workers_are_single_threaded(process_pool):
+    """Test pool workers run Numba on one thread"""
+    assert process_pool.submit(get_num_threads).result() == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("threshold, expected_submitted", [("0", 1), ("100000", 0)])
+async def test_score_candidates_process_pool_routing(
+    process_pool, monkeypatch, threshold, expected_submitted
+):
+    """Test batches above the threshold are scored in the process pool"""
+    monkeypatch.setattr(app.state, "process_pool", process_pool, raising=False)
+    monkeypatch.setenv("PROCESS_POOL_THRESHOLD", threshold)
+    process_pool.submitted = 0
+    
+    mutation = """
+    mutation ScoreCandidates($input: ScoreCandidatesInput!) {
+      scoreCandidates(input: $input) {
+        candidates {
+          invoiceId
+          transactionId
+          score
+          explanation
+        }
+        totalProcessed
+      }
+    }
+    """
+    
+    variables = {
+        "input": {
+            "tenantId": "test-tenant",
+            "invoices": [
+                {
+                    "id": "inv-1",
+                    "amount": "1000.00",
+                    "currency": "USD",
+                    "invoiceDate": "2024-01-15T00:00:00Z",
+                    "description": "Test invoice",
+                    "invoiceNumber": "INV-001"
+                }
+            ],
+            "transactions": [
+                {
+                    "id": "txn-1",
+                    "amount": "1000.00",
+                    "currency": "USD",
+                    "postedAt": "2024-01-15T10:00:00Z",
+                    "description": "Payment for INV-001"
+                }
+            ],
+            "topN": 5
+        }
+    }
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/graphql",
+            json={
+                "query": mutation,
+                "variables": variables
+            }
+        )
+    
+    assert response.status_code == 200
+    result = response.json()["data"]["scoreCandidates"]
+    assert process_pool.submitted == expected_submitted
+    assert result["totalProcessed"] == 1
+    assert len(result["candidates"]) == 1
+    assert result["candidates"][0]["transactionId"] == "txn-1"
+    assert result["candidates"][0]["score"] > 0
@@ -1,7 +1,9 @@
+import pickle
 import pytest
 from decimal import Decimal
 from datetime import datetime, timedelta
-from app.engine.scorer import ReconciliationScorer
+from app.engine import scorer as scorer_module
+from app.engine.scorer import ReconciliationScorer, _cached_partial_ratio, _score_worker
 
 
 @pytest.fixture
@@ -39,6 +41,45 @@ def test_amount_outside_tolerance(scorer):
     assert score < 0.5
 
 
+def test_amount_score_input_types_agree(scorer):
+    """Test Decimal, float and string amounts score identically"""
+    expected = scorer.calculate_amount_score(Decimal("1000.00"), Decimal("1010.00"))
+    
+    assert scorer.calculate_amount_score(1000.0, 1010.0) == expected
+    assert scorer.calculate_amount_score("1000.00", "1010.00") == expected
+
+
+def test_amount_score_at_column_max(scorer):
+    """Test amounts at the DECIMAL(15, 2) maximum don't overflow"""
+    score, explanation = scorer.calculate_amount_score("9999999999999.99", "1.00")
+    assert score == 0.0
+    assert "differs by 200.0%" in explanation
+    
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '9999999999999.99',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=5)
+    assert len(candidates) == 1
+    assert candidates[0].amount_score == 0.0
+
+
 def test_same_day_date_match(scorer):
     """Test same day transaction gets perfect score"""
     date = datetime(2024, 1, 15)
@@ -66,6 +107,17 @@ def test_date_outside_proximity(scorer):
     assert score < 0.5
 
 
+def test_date_score_from_ordinals(scorer):
+    """Test ordinal-day scoring matches datetime scoring"""
+    invoice_date = datetime(2024, 1, 15)
+    transaction_date = datetime(2024, 1, 17, 23, 30)
+    
+    assert scorer.calculate_date_score_ord(
+        invoice_date.toordinal(), transaction_date.toordinal()
+    ) == scorer.calculate_date_score(invoice_date, transaction_date)
+    assert scorer.calculate_date_score_ord(None, transaction_date.toordinal())[0] == 0.5
+
+
 def test_text_exact_match(scorer):
     """Test exact text match"""
     score, explanation = scorer.calculate_text_score(
@@ -105,6 +157,33 @@ def test_vendor_name_in_description(scorer):
     assert score >= 0.85
 
 
+def test_text_score_cache(scorer):
+    """Test repeated text comparisons are served from the cache"""
+    scorer.clear_cache()
+    first = scorer.calculate_text_score("Office Supplies", "Payment for office supplies")
+    second = scorer.calculate_text_score("office supplies", "PAYMENT FOR OFFICE SUPPLIES")
+    
+    assert first == second
+    assert _cached_partial_ratio.cache_info().hits > 0
+    
+    scorer.clear_cache()
+    assert _cached_partial_ratio.cache_info().currsize == 0
+
+
+def test_substring_match_skips_fuzzy(scorer):
+    """Test a literal invoice number decides the score without fuzzy matching"""
+    scorer.clear_cache()
+    score, explanation = scorer.calculate_text_score(
+        invoice_desc="Office supplies",
+        transaction_desc="Payment ref INV-12345",
+        invoice_number="INV-12345"
+    )
+    
+    assert score == 1.0
+    assert "INV-12345" in explanation
+    assert _cached_partial_ratio.cache_info().misses == 0
+
+
 def test_no_text_data(scorer):
     """Test handling of missing text data"""
     score, explanation = scorer.calculate_text_score(None, None)
@@ -222,4 +301,506 @@ def test_currency_mismatch_skipped(scorer):
     
     candidates = scorer.score_candidates(invoices, transactions, top_n=5)
     
-    assert len(candidates) == 0
\ No newline at end of file
+    assert len(candidates) == 0
+
+
+def test_score_candidates_text_matches_single_pair(scorer):
+    """Test batched text scoring agrees with calculate_text_score"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies',
+            'invoice_number': 'INV-12345',
+            'vendor_name': 'Acme Corp'
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Payment ref INV-12345'
+        },
+        {
+            'id': 'txn-2',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': None
+        }
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=5)
+    by_txn = {c.transaction_id: c for c in candidates}
+    
+    for transaction in transactions:
+        expected, _ = scorer.calculate_text_score(
+            'Office supplies', transaction['description'], 'INV-12345', 'Acme Corp'
+        )
+        assert by_txn[transaction['id']].text_score == pytest.approx(expected * 100)
+
+
+def test_score_candidates_matches_score_match(scorer):
+    """Test vectorized batch scoring agrees with single-pair score_match"""
+    invoice = {
+        'id': 'inv-1',
+        'amount': '1000.00',
+        'currency': 'USD',
+        'invoice_date': datetime(2024, 1, 15),
+        'description': 'Office supplies',
+        'invoice_number': 'INV-001',
+        'vendor_name': 'Acme Corp'
+    }
+    
+    transactions = [
+        {
+            'id': f'txn-{k}',
+            'amount': amount,
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15) + timedelta(days=days),
+            'description': description
+        }
+        for k, (amount, days, description) in enumerate([
+            ('1000.00', 0, 'Payment for INV-001'),
+            ('1010.00', 2, 'Acme Corp office supplies'),
+            ('1100.00', 10, 'Unrelated payment'),
+        ])
+    ]
+    
+    candidates = scorer.score_candidates([invoice], transactions, top_n=5)
+    
+    assert len(candidates) == 3
+    for candidate in candidates:
+        transaction = next(t for t in transactions if t['id'] == candidate.transaction_id)
+        expected = scorer.score_match(
+            invoice_id=invoice['id'],
+            invoice_amount=Decimal(invoice['amount']),
+            invoice_date=invoice['invoice_date'],
+            invoice_desc=invoice['description'],
+            invoice_number=invoice['invoice_number'],
+            vendor_name=invoice['vendor_name'],
+            transaction_id=transaction['id'],
+            transaction_amount=Decimal(transaction['amount']),
+            transaction_date=transaction['posted_at'],
+            transaction_desc=transaction['description'],
+        )
+        assert candidate.score == pytest.approx(expected.score)
+        assert candidate.explanation == expected.explanation
+
+
+def test_score_candidates_multi_currency(scorer):
+    """Test invoices are only matched within their own currency"""
+    invoices = [
+        {
+            'id': f'inv-{currency}',
+            'amount': '1000.00',
+            'currency': currency,
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Invoice',
+            'invoice_number': None,
+            'vendor_name': None
+        }
+        for currency in ('USD', 'EUR', 'GBP')
+    ]
+    
+    transactions = [
+        {
+            'id': f'txn-{currency}-{k}',
+            'amount': '1000.00',
+            'currency': currency,
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Payment'
+        }
+        for currency in ('USD', 'EUR', 'JPY')
+        for k in range(2)
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=5)
+    
+    assert len(candidates) == 4
+    for candidate in candidates:
+        currency = candidate.invoice_id.split('-')[1]
+        assert candidate.transaction_id.startswith(f'txn-{currency}-')
+
+
+def test_score_candidates_ties_keep_invoice_order(scorer):
+    """Test equal scores come back in input invoice order across currencies"""
+    invoices = [
+        {
+            'id': f'inv-{k}',
+            'amount': '1000.00',
+            'currency': currency,
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Invoice',
+            'invoice_number': None,
+            'vendor_name': None
+        }
+        for k, currency in enumerate(('EUR', 'USD', 'EUR', 'USD'))
+    ]
+    
+    transactions = [
+        {
+            'id': f'txn-{currency}',
+            'amount': '1000.00',
+            'currency': currency,
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Payment'
+        }
+        for currency in ('USD', 'EUR')
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=5)
+    
+    assert len({candidate.score for candidate in candidates}) == 1
+    assert [candidate.invoice_id for candidate in candidates] == [
+        'inv-0', 'inv-1', 'inv-2', 'inv-3'
+    ]
+
+
+def test_score_candidates_blocks_distant_pairs(scorer):
+    """Test pairs far apart on both amount and date skip fuzzy matching"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies',
+            'invoice_number': 'INV-001',
+            'vendor_name': None
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1500.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 3, 15),
+            'description': 'Office supplies payment'
+        }
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=5)
+    
+    assert len(candidates) == 1
+    assert candidates[0].text_score == pytest.approx(30.0)
+    assert "Not compared (amount and date too far apart)" in candidates[0].explanation
+
+
+def test_score_candidates_blocked_pair_keeps_substring_match(scorer):
+    """Test a blocked pair keeps its literal invoice number match, as in score_match"""
+    invoice = {
+        'id': 'inv-1',
+        'amount': '1000.00',
+        'currency': 'USD',
+        'invoice_date': datetime(2024, 1, 15),
+        'description': None,
+        'invoice_number': 'INV-001',
+        'vendor_name': None
+    }
+    
+    transaction = {
+        'id': 'txn-1',
+        'amount': '1300.00',
+        'currency': 'USD',
+        'posted_at': datetime(2024, 1, 15) + timedelta(days=45),
+        'description': 'Payment for INV-001'
+    }
+    
+    candidates = scorer.score_candidates([invoice], [transaction], top_n=5)
+    expected = scorer.score_match(
+        invoice_id=invoice['id'],
+        invoice_amount=Decimal(invoice['amount']),
+        invoice_date=invoice['invoice_date'],
+        invoice_desc=invoice['description'],
+        invoice_number=invoice['invoice_number'],
+        vendor_name=invoice['vendor_name'],
+        transaction_id=transaction['id'],
+        transaction_amount=Decimal(transaction['amount']),
+        transaction_date=transaction['posted_at'],
+        transaction_desc=transaction['description'],
+    )
+    
+    assert len(candidates) == 1
+    assert candidates[0].text_score == pytest.approx(100.0)
+    assert candidates[0].score == pytest.approx(expected.score)
+    assert candidates[0].explanation == expected.explanation
+
+
+def test_score_candidates_top_n_zero(scorer):
+    """Test top_n=0 returns no candidates"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    assert scorer.score_candidates(invoices, transactions, top_n=0) == []
+
+
+def test_score_candidates_negative_top_n(scorer):
+    """Test a negative top_n returns no candidates"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    assert scorer.score_candidates(invoices, transactions, top_n=-1) == []
+
+
+def test_score_candidates_skips_pairs_outside_top_n(scorer):
+    """Test pairs that can't reach the top N are never fuzzy matched"""
+    updated_at = datetime(2024, 1, 10)
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies',
+            'updated_at': updated_at
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Card payment',
+            'updated_at': updated_at
+        },
+        {
+            'id': 'txn-2',
+            'amount': '1190.00',  # Within blocking range, but even a perfect
+            'currency': 'USD',    # text match can't beat txn-1
+            'posted_at': datetime(2024, 2, 9),
+            'description': 'Office supplies',
+            'updated_at': updated_at
+        }
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=1)
+    
+    assert [c.transaction_id for c in candidates] == ['txn-1']
+    # Only the txn-1 pair went through fuzzy matching (and into the cache)
+    assert len(scorer._score_cache) == 1
+
+
+def test_score_candidates_tiled_matches_untiled(scorer, monkeypatch):
+    """Test splitting invoices into tiles doesn't change the result"""
+    invoices = [
+        {
+            'id': f'inv-{k}',
+            'amount': f'{1000 + k * 5}.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 10 + k),
+            'description': f'Invoice {k}',
+            'invoice_number': f'INV-{k:03d}'
+        }
+        for k in range(5)
+    ]
+    
+    transactions = [
+        {
+            'id': f'txn-{k}',
+            'amount': f'{1000 + k * 7}.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 12 + k),
+            'description': f'Payment INV-{k:03d}'
+        }
+        for k in range(4)
+    ]
+    
+    expected = scorer.score_candidates(invoices, transactions, top_n=2)
+    
+    # One invoice per tile
+    monkeypatch.setattr(scorer_module, 'SCORE_TILE_PAIRS', 1)
+    tiled = scorer.score_candidates(invoices, transactions, top_n=2)
+    
+    assert [(c.invoice_id, c.transaction_id, c.score) for c in tiled] == \
+        [(c.invoice_id, c.transaction_id, c.score) for c in expected]
+
+
+def test_score_candidates_trigram_blocking():
+    """Test pairs without shared trigrams skip fuzzy text matching when enabled"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies'
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Wire ref xyz'  # No trigram in common
+        }
+    ]
+    
+    unblocked = ReconciliationScorer().score_candidates(invoices, transactions)
+    blocked = ReconciliationScorer(text_blocking_min_trigrams=1).score_candidates(
+        invoices, transactions
+    )
+    
+    assert unblocked[0].text_score > 0
+    assert blocked[0].text_score == 0
+
+
+def test_score_candidates_drops_below_min_score(scorer):
+    """Test candidates below min_candidate_score are not returned"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': None,
+            'invoice_number': None,
+            'vendor_name': None
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Payment'
+        },
+        {
+            'id': 'txn-2',
+            'amount': '9000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 6, 15),
+            'description': 'Payment'
+        }
+    ]
+    
+    candidates = scorer.score_candidates(invoices, transactions, top_n=5)
+    
+    assert [c.transaction_id for c in candidates] == ['txn-1']
+
+
+def test_score_cache_reused_across_runs(scorer):
+    """Test fuzzy ratios are cached per (invoice, transaction) version"""
+    updated_at = datetime(2024, 1, 10)
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies',
+            'invoice_number': None,
+            'vendor_name': None,
+            'updated_at': updated_at
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 15),
+            'description': 'Office supplies',
+            'updated_at': updated_at
+        }
+    ]
+    
+    first = scorer.score_candidates(invoices, transactions, top_n=1)
+    
+    # Same row versions: the cached ratio is used even though the text changed
+    transactions[0]['description'] = 'Something else'
+    second = scorer.score_candidates(invoices, transactions, top_n=1)
+    assert second[0].text_score == first[0].text_score
+    
+    # A newer transaction version is rescored
+    transactions[0]['updated_at'] = datetime(2024, 1, 11)
+    third = scorer.score_candidates(invoices, transactions, top_n=1)
+    assert third[0].text_score < first[0].text_score
+
+
+def test_score_worker_matches_in_process(scorer):
+    """Test the process-pool worker rebuilds an equivalent scorer"""
+    invoices = [
+        {
+            'id': 'inv-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'invoice_date': datetime(2024, 1, 15),
+            'description': 'Office supplies',
+            'invoice_number': 'INV-001',
+            'vendor_name': 'Acme Corp'
+        }
+    ]
+    
+    transactions = [
+        {
+            'id': 'txn-1',
+            'amount': '1000.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 16),
+            'description': 'Payment INV-001'
+        },
+        {
+            'id': 'txn-2',
+            'amount': '990.00',
+            'currency': 'USD',
+            'posted_at': datetime(2024, 1, 20),
+            'description': 'Office supplies order'
+        }
+    ]
+    
+    expected = scorer.score_candidates(invoices, transactions, top_n=5)
+    # Results travel back from the worker pickled
+    result = pickle.loads(pickle.dumps(
+        _score_worker(scorer.get_config(), invoices, transactions, 5)
+    ))
+    
+    assert [(c.transaction_id, c.score, c.explanation) for c in result] == \
+        [(c.transaction_id, c.score, c.explanation) for c in expected]